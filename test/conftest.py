@@ -0,0 +1,34 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+import pytest
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Keep pytest's temp dirs on tmpfs when available.
+
+    The tests create many small trees and .dirdb files in tmp_path; keeping
+    them in RAM only makes the suite faster, results do not depend on it.
+    Only the temp root moves, so pytest keeps its numbered per-run
+    directories and their cleanup. An explicit --basetemp, TMPDIR or
+    PYTEST_DEBUG_TEMPROOT always wins.
+    """
+    if config.option.basetemp is not None:
+        return
+    if os.environ.get("TMPDIR") or os.environ.get("PYTEST_DEBUG_TEMPROOT"):
+        return
+    shm = "/dev/shm"
+    if sys.platform.startswith("linux") and os.path.ismount(shm) and os.access(shm, os.W_OK):
+        tempfile.tempdir = shm
+
+
+@pytest.fixture
+def two_dirs(tmp_path: Path):
+    """Empty roots tmp_path/a and tmp_path/b."""
+    dir_a = tmp_path / "a"
+    dir_b = tmp_path / "b"
+    dir_a.mkdir()
+    dir_b.mkdir()
+    return dir_a, dir_b
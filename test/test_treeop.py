@@ -1,3 +1,5 @@
+import fcntl
+import functools
 import os
 import pty
 import re
@@ -5,62 +7,90 @@ import select
 import subprocess
 import time
 from pathlib import Path
+from typing import Final
 import pytest
 
 
-def treeop_bin() -> Path:
-    root = Path(__file__).resolve().parents[1]
-    bin_path = Path(os.environ.get("TREEOP_BIN", root / "treeop"))
-    return bin_path
+_REPO_ROOT: Final[Path] = Path(__file__).resolve().parents[1]
+_BIN: Final[Path] = Path(os.environ.get("TREEOP_BIN", _REPO_ROOT / "treeop"))
 
+# A prebuilt TREEOP_BIN is never rebuilt, so a missing one can be skipped before setting up anything.
+pytestmark = pytest.mark.skipif(
+    "TREEOP_BIN" in os.environ and not _BIN.exists(),
+    reason="TREEOP_BIN does not point at a treeop binary",
+)
+
+# Patterns asserted by several tests.
+_RE_REMOVED_FILES_1 = re.compile(r"removed-files:\s+1")
+_RE_REMOVED_FILES_2 = re.compile(r"removed-files:\s+2")
+_RE_REMOVED_DIRS_2 = re.compile(r"removed-dirs:\s+2")
+_RE_SHARED_FILES_2 = re.compile(r"shared-files:\s+2")
+_RE_FILES_1 = re.compile(r"files:\s+1")
+_RE_REMOVE_FROM_A_1 = re.compile(r"remove from A:\s+\d+\.?\d* bytes,\s+1 files")
+_RE_REMOVE_FROM_B_1 = re.compile(r"remove from B:\s+\d+\.?\d* bytes,\s+1 files")
+_RE_WOULD_REMOVE_LINE = re.compile(r"^[0-9a-f]+: Would remove ", re.MULTILINE)
+_RE_HARDLINKS_CREATED_0 = re.compile(r"hardlinks-created:\s+0")
+_RE_HARDLINKS_CREATED_1 = re.compile(r"hardlinks-created:\s+1")
 
-def run_treeop(args, cwd: Path):
-    bin_path = treeop_bin()
-    if "TREEOP_BIN" not in os.environ:
-        subprocess.run(["make"], cwd=cwd, check=True, capture_output=True, text=True)
-    if not bin_path.exists():
-        subprocess.run(["make"], cwd=cwd, check=True, capture_output=True, text=True)
-        if not bin_path.exists():
-            raise FileNotFoundError(f"treeop binary not found after make: {bin_path}")
-    result = subprocess.run(
-        [str(bin_path)] + args,
-        cwd=cwd,
-        text=True,
-        capture_output=True,
-        check=True,
-    )
-    return result.stdout
 
+@pytest.fixture(scope="session", autouse=True)
+def _ensure_built():
+    """Build treeop once per session unless TREEOP_BIN points at a prebuilt binary.
 
-def run_treeop_result(args, cwd: Path):
-    bin_path = treeop_bin()
+    A failed build fails every test with make's output. A missing
+    TREEOP_BIN binary is skipped by pytestmark before this runs.
+    """
     if "TREEOP_BIN" not in os.environ:
-        subprocess.run(["make"], cwd=cwd, check=True, capture_output=True, text=True)
-    if not bin_path.exists():
-        subprocess.run(["make"], cwd=cwd, check=True, capture_output=True, text=True)
-        if not bin_path.exists():
-            raise FileNotFoundError(f"treeop binary not found after make: {bin_path}")
+        # Serialize the build between pytest-xdist workers sharing this tree.
+        with open(_REPO_ROOT / "Makefile", "rb") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            result = subprocess.run(
+                ["make", f"-j{os.cpu_count() or 1}"], cwd=_REPO_ROOT, capture_output=True, text=True
+            )
+        if result.returncode != 0:
+            pytest.fail(f"make failed:\n{result.stdout}{result.stderr}")
+    if hasattr(os, "posix_fadvise"):
+        # Start reading the binary into the page cache before the first test execs it.
+        fd = os.open(_BIN, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+
+def run_treeop_result(args, cwd: Path, check: bool = False, text: bool = True):
     return subprocess.run(
-        [str(bin_path)] + args,
+        [_BIN, *args],
         cwd=cwd,
-        text=True,
+        text=text,
         capture_output=True,
-        check=False,
+        check=check,
     )
 
 
-def run_treeop_pty(args, cwd: Path, input_after_title: bytes):
-    bin_path = treeop_bin()
-    if "TREEOP_BIN" not in os.environ:
-        subprocess.run(["make"], cwd=cwd, check=True, capture_output=True, text=True)
-    if not bin_path.exists():
-        subprocess.run(["make"], cwd=cwd, check=True, capture_output=True, text=True)
-        if not bin_path.exists():
-            raise FileNotFoundError(f"treeop binary not found after make: {bin_path}")
+def run_treeop(args, cwd: Path, capture: bool = True, text: bool = True):
+    if not capture:
+        subprocess.run(
+            [_BIN, *args],
+            cwd=cwd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        return None
+    return run_treeop_result(args, cwd, check=True, text=text).stdout
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_run(args: tuple, cwd: str) -> str:
+    """Run treeop once per distinct argv; only for runs that leave shared_tree unchanged."""
+    return run_treeop(list(args), Path(cwd))
 
+
+def run_treeop_pty(args, cwd: Path, input_after_title: bytes):
     master_fd, slave_fd = pty.openpty()
     proc = subprocess.Popen(
-        [str(bin_path)] + args,
+        [_BIN, *args],
         cwd=cwd,
         stdin=slave_fd,
         stdout=slave_fd,
@@ -94,7 +124,7 @@ def run_treeop_pty(args, cwd: Path, input_after_title: bytes):
         if proc.returncode != 0:
             raise subprocess.CalledProcessError(
                 proc.returncode,
-                [str(bin_path)] + args,
+                [_BIN, *args],
                 output=bytes(out).decode("utf-8", errors="replace"),
             )
         return bytes(out).decode("utf-8", errors="replace")
@@ -102,37 +132,82 @@ def run_treeop_pty(args, cwd: Path, input_after_title: bytes):
         os.close(master_fd)
 
 
-def write_file(path: Path, content: str):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+def write_file(path: Path, content: str | bytes):
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    try:
+        fd = os.open(path, flags, 0o644)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, flags, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
 
 
-def extract_hash(output: str, filename: str) -> str:
-    for line in output.splitlines():
-        if line.endswith(filename):
-            parts = line.split()
-            if len(parts) >= 2:
-                return parts[1]
-    raise AssertionError(f"hash not found for {filename} in output:\n{output}")
+def bump_mtime_back(path: Path, seconds: int = 2):
+    """Make path look older than files written afterwards, without sleeping."""
+    st = path.stat()
+    os.utime(path, (st.st_atime - seconds, st.st_mtime - seconds))
 
 
-def test_intersect_stats_two_roots(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
+@functools.lru_cache(maxsize=None)
+def _stat_re(label: str) -> re.Pattern:
+    return re.compile(rf"{re.escape(label)}\s+([0-9]+)", re.MULTILINE)
 
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
 
+@functools.lru_cache(maxsize=128)
+def _hash_re(filename: str) -> re.Pattern:
+    # Columns are separated by [ \t], not \s: under MULTILINE, bytes \s also
+    # matches b"\n" and would let the match start on an earlier line.
+    return re.compile(rb"^[ \t]*\S+[ \t]+(\S+)[ \t].*" + re.escape(filename.encode()) + rb"$", re.MULTILINE)
+
+
+def extract_hash(output: bytes, filename: str) -> str:
+    """Return the hash column for filename from undecoded --list-files output."""
+    match = _hash_re(filename).search(output)
+    if match:
+        return match.group(1).decode("ascii")
+    raise AssertionError(f"hash not found for {filename} in output:\n{output.decode('utf-8', errors='replace')}")
+
+
+@pytest.fixture(scope="session")
+def shared_tree(tmp_path_factory):
+    """Two roots shared by tests that do not change them.
+
+    Indexed up front, so every user sees the same existing .dirdb files
+    regardless of test order.
+    """
+    base = tmp_path_factory.mktemp("shared")
+    dir_a = base / "a"
+    dir_b = base / "b"
     write_file(dir_a / "same.txt", "hello")
     write_file(dir_a / "onlyA.txt", "only a")
     write_file(dir_b / "same.txt", "hello")
     write_file(dir_b / "onlyB.txt", "only b")
+    write_file(dir_b / "two.txt", "hello")
+    run_treeop([str(dir_a), str(dir_b)], _REPO_ROOT, capture=False)
+    return dir_a, dir_b
+
+
+@pytest.fixture(scope="session")
+def hardlinks_supported(tmp_path_factory: pytest.TempPathFactory) -> bool:
+    """Whether the temp filesystem can hardlink, probed once per session."""
+    probe = tmp_path_factory.mktemp("hl_probe")
+    src = probe / "hl_src"
+    write_file(src, "x")
+    try:
+        os.link(src, probe / "hl_dst")
+    except OSError:
+        return False
+    return True
+
 
-    out = run_treeop(["--intersect", str(dir_a), str(dir_b)], root)
+def test_intersect_stats_two_roots(shared_tree):
+    dir_a, dir_b = shared_tree
+
+    out = _cached_run(("--intersect", str(dir_a), str(dir_b)), str(_REPO_ROOT))
     assert f"{dir_a}:" in out
     assert f"{dir_b}:" in out
     assert "unique-files:" in out
@@ -142,41 +217,25 @@ def test_intersect_stats_two_roots(tmp_path: Path):
     assert out.splitlines().count("----------------------------------------") == 2
 
 
-def test_intersect_min_size_filters_file_sets(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_intersect_min_size_filters_file_sets(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "small-shared.txt", "xx")
     write_file(dir_b / "small-shared.txt", "xx")
     write_file(dir_a / "large-shared.txt", "large-data")
     write_file(dir_b / "large-shared.txt", "large-data")
 
-    out = run_treeop(["--intersect", "--min-size", "5", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--intersect", "--min-size", "5", str(dir_a), str(dir_b)], _REPO_ROOT)
     total_section = out.split("total:\n", 1)[1]
 
     assert re.search(r"total-files:\s+2", total_section)
     assert re.search(r"total-size:\s+20 bytes", total_section)
-    assert re.search(r"shared-files:\s+2", total_section)
+    assert _RE_SHARED_FILES_2.search(total_section)
     assert "small-shared.txt" not in out
 
 
-def test_containment_reports_nested_complete_mostly_and_missing_dirs(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_containment_reports_nested_complete_mostly_and_missing_dirs(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "complete" / "nested" / "all.txt", "all")
     write_file(dir_b / "copies" / "all-copy.txt", "all")
@@ -193,7 +252,7 @@ def test_containment_reports_nested_complete_mostly_and_missing_dirs(tmp_path: P
         write_file(dir_a / "mostly_not" / f"missing-{i}.txt", f"mostly-not-missing-{i}")
     write_file(dir_b / "extra" / "only-b.txt", "only-b")
 
-    out = run_treeop(["--containment", str(dir_b), str(dir_a)], root)
+    out = run_treeop(["--containment", str(dir_b), str(dir_a)], _REPO_ROOT)
 
     assert f"{dir_a} in previous roots ({dir_b}):" in out
     assert f"{dir_b} in previous roots" not in out
@@ -205,7 +264,7 @@ def test_containment_reports_nested_complete_mostly_and_missing_dirs(tmp_path: P
     assert "mostly-not-contained-dirs:" not in out
     assert "not-contained-dirs:" not in out
 
-    out = run_treeop(["--containment", "--show-not-contained", str(dir_b), str(dir_a)], root)
+    out = run_treeop(["--containment", "--show-not-contained", str(dir_b), str(dir_a)], _REPO_ROOT)
 
     assert "mostly-not-contained-dirs:" in out
     assert re.search(r"mostly_not .*files=1 / 11 \(9.1%\)", out)
@@ -215,11 +274,6 @@ def test_containment_reports_nested_complete_mostly_and_missing_dirs(tmp_path: P
 
 
 def test_containment_combines_first_dirs(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_b = tmp_path / "b"
     dir_c = tmp_path / "c"
@@ -232,7 +286,7 @@ def test_containment_combines_first_dirs(tmp_path: Path):
     write_file(dir_c / "nested" / "one.txt", "one")
     write_file(dir_c / "nested" / "two.txt", "two")
 
-    out = run_treeop(["-c", str(dir_a), str(dir_b), str(dir_c)], root)
+    out = run_treeop(["-c", str(dir_a), str(dir_b), str(dir_c)], _REPO_ROOT)
 
     assert f"{dir_c} in previous roots ({dir_a}, {dir_b}):" in out
     assert re.search(r"files:\s+2 / 2 \(100.0%\)", out)
@@ -240,56 +294,32 @@ def test_containment_combines_first_dirs(tmp_path: Path):
     assert "nested" not in out
 
 
-def test_containment_suppresses_children_when_root_complete(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_containment_suppresses_children_when_root_complete(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "copy.txt", "same")
     write_file(dir_b / "x" / "y" / "file.txt", "same")
 
-    out = run_treeop(["--containment", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--containment", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert re.search(r"\n  \. files=1 / 1 \(100.0%\)", out)
     assert "x/y" not in out
 
 
-def test_containment_suppresses_children_when_root_not_contained(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_containment_suppresses_children_when_root_not_contained(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "different.txt", "different")
     write_file(dir_b / "x" / "y" / "file.txt", "missing")
 
-    out = run_treeop(["--containment", "--show-not-contained", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--containment", "--show-not-contained", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert re.search(r"\n  \. files=0 / 1 \(0.0%\)", out)
     assert "x/y" not in out
 
 
-def test_containment_file_lists_honor_min_size(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_containment_file_lists_honor_min_size(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "copy-contained.txt", "contained-large")
     write_file(dir_a / "copy-small.txt", "xx")
@@ -306,7 +336,7 @@ def test_containment_file_lists_honor_min_size(tmp_path: Path):
         "5",
         str(dir_a),
         str(dir_b),
-    ], root)
+    ], _REPO_ROOT)
 
     contained = out.split("contained-files:\n", 1)[1].split("not-contained-files:\n", 1)[0]
     not_contained = out.split("not-contained-files:\n", 1)[1]
@@ -319,58 +349,34 @@ def test_containment_file_lists_honor_min_size(tmp_path: Path):
     assert "small-missing.txt" not in not_contained
 
 
-def test_show_contained_files_lists_contained_files(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_show_contained_files_lists_contained_files(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "copy.txt", "contained")
     write_file(dir_b / "contained.txt", "contained")
     write_file(dir_b / "missing.txt", "missing")
 
-    out = run_treeop(["--containment", "--show-contained-files", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--containment", "--show-contained-files", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     contained = out.split("contained-files:\n", 1)[1]
     assert "contained.txt" in contained
     assert "missing.txt" not in contained
 
 
-def test_containment_file_lists_require_containment(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_containment_file_lists_require_containment(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
-    result = run_treeop_result(["--show-contained-files", str(dir_a), str(dir_b)], root)
+    result = run_treeop_result(["--show-contained-files", str(dir_a), str(dir_b)], _REPO_ROOT)
     assert result.returncode != 0
     assert "--show-contained-files/--show-not-contained-files require --containment." in result.stdout
     assert not (dir_a / ".dirdb").exists()
     assert not (dir_b / ".dirdb").exists()
 
 
-def test_show_not_contained_requires_containment(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
+def test_show_not_contained_requires_containment(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
-
-    result = run_treeop_result(["--show-not-contained", str(dir_a), str(dir_b)], root)
+    result = run_treeop_result(["--show-not-contained", str(dir_a), str(dir_b)], _REPO_ROOT)
     assert result.returncode != 0
     assert "--show-not-contained requires --containment." in result.stdout
     assert not (dir_a / ".dirdb").exists()
@@ -378,31 +384,18 @@ def test_show_not_contained_requires_containment(tmp_path: Path):
 
 
 def test_containment_requires_at_least_two_dirs_before_processing(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "file.txt", "hello")
 
-    result = run_treeop_result(["--containment", str(dir_a)], root)
+    result = run_treeop_result(["--containment", str(dir_a)], _REPO_ROOT)
     assert result.returncode != 0
     assert "--containment requires at least two paths." in result.stdout
     assert not (dir_a / ".dirdb").exists()
 
 
-def test_remove_contained_dirs_dry_run(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_contained_dirs_dry_run(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "copy-one.txt", "one")
     write_file(dir_a / "copy-two.txt", "two")
@@ -411,26 +404,18 @@ def test_remove_contained_dirs_dry_run(tmp_path: Path):
     write_file(dir_b / "partial" / "one.txt", "one")
     write_file(dir_b / "partial" / "unique.txt", "unique")
 
-    out = run_treeop(["--containment", "--remove-contained-dirs", "--dry-run", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--containment", "--remove-contained-dirs", "--dry-run", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert "remove-contained-dirs:" in out
     assert f"Would remove dir {dir_b / 'complete'}" in out
-    assert re.search(r"removed-dirs:\s+2", out)
-    assert re.search(r"removed-files:\s+2", out)
+    assert _RE_REMOVED_DIRS_2.search(out)
+    assert _RE_REMOVED_FILES_2.search(out)
     assert (dir_b / "complete" / "nested" / "one.txt").exists()
     assert (dir_b / "partial" / "unique.txt").exists()
 
 
-def test_remove_contained_dirs_actual(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_contained_dirs_actual(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "copy-one.txt", "one")
     write_file(dir_a / "copy-two.txt", "two")
@@ -439,28 +424,20 @@ def test_remove_contained_dirs_actual(tmp_path: Path):
     write_file(dir_b / "partial" / "one.txt", "one")
     write_file(dir_b / "partial" / "unique.txt", "unique")
 
-    out = run_treeop(["--containment", "--remove-contained-dirs", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--containment", "--remove-contained-dirs", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert "remove-contained-dirs:" in out
-    assert re.search(r"removed-dirs:\s+2", out)
-    assert re.search(r"removed-files:\s+2", out)
+    assert _RE_REMOVED_DIRS_2.search(out)
+    assert _RE_REMOVED_FILES_2.search(out)
     assert not (dir_b / "complete").exists()
     assert (dir_b / "partial" / "one.txt").exists()
     assert (dir_b / "partial" / "unique.txt").exists()
 
 
-def test_remove_contained_requires_containment(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
+def test_remove_contained_requires_containment(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
-
-    result = run_treeop_result(["--remove-contained-dirs", str(dir_a), str(dir_b)], root)
+    result = run_treeop_result(["--remove-contained-dirs", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert result.returncode != 0
     assert "--remove-contained-dirs/--remove-contained-files require --containment." in result.stdout
@@ -468,40 +445,24 @@ def test_remove_contained_requires_containment(tmp_path: Path):
     assert not (dir_b / ".dirdb").exists()
 
 
-def test_remove_contained_files_dry_run(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_contained_files_dry_run(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "copy.txt", "contained")
     write_file(dir_b / "contained.txt", "contained")
     write_file(dir_b / "missing.txt", "missing")
 
-    out = run_treeop(["--containment", "--remove-contained-files", "--dry-run", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--containment", "--remove-contained-files", "--dry-run", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert "remove-contained-files:" in out
     assert f"Would remove {dir_b / 'contained.txt'}" in out
-    assert re.search(r"removed-files:\s+1", out)
+    assert _RE_REMOVED_FILES_1.search(out)
     assert (dir_b / "contained.txt").exists()
     assert (dir_b / "missing.txt").exists()
 
 
-def test_remove_contained_files_actual(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_contained_files_actual(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "copy.txt", "contained")
     write_file(dir_a / "small-copy.txt", "xx")
@@ -509,27 +470,19 @@ def test_remove_contained_files_actual(tmp_path: Path):
     write_file(dir_b / "small-contained.txt", "xx")
     write_file(dir_b / "missing.txt", "missing")
 
-    out = run_treeop(["--containment", "--remove-contained-files", "--min-size", "5", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--containment", "--remove-contained-files", "--min-size", "5", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert "remove-contained-files:" in out
-    assert re.search(r"removed-files:\s+1", out)
+    assert _RE_REMOVED_FILES_1.search(out)
     assert not (dir_b / "contained.txt").exists()
     assert (dir_b / "small-contained.txt").exists()
     assert (dir_b / "missing.txt").exists()
 
 
-def test_remove_contained_dirs_and_files_conflict(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_contained_dirs_and_files_conflict(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
-    result = run_treeop_result(["--containment", "--remove-contained-dirs", "--remove-contained-files", str(dir_a), str(dir_b)], root)
+    result = run_treeop_result(["--containment", "--remove-contained-dirs", "--remove-contained-files", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert result.returncode != 0
     assert "Cannot combine --remove-contained-dirs with --remove-contained-files." in result.stdout
@@ -537,16 +490,8 @@ def test_remove_contained_dirs_and_files_conflict(tmp_path: Path):
     assert not (dir_b / ".dirdb").exists()
 
 
-def test_find_overlapping_dirs_top_lists_best_pair(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_find_overlapping_dirs_top_lists_best_pair(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "source" / "shared-one.txt", "shared-one")
     write_file(dir_a / "source" / "shared-two.txt", "shared-two")
@@ -557,7 +502,7 @@ def test_find_overlapping_dirs_top_lists_best_pair(tmp_path: Path):
     write_file(dir_b / "partial" / "copy-one.txt", "shared-one")
     write_file(dir_b / "partial" / "different.txt", "different")
 
-    out = run_treeop(["--find-overlapping-dirs", "--top", "1", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--find-overlapping-dirs", "--top", "1", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert "overlapping-dirs:" in out
     assert f"A: {dir_a / 'source'}" in out or f"A: {dir_b / 'copy'}" in out
@@ -571,37 +516,21 @@ def test_find_overlapping_dirs_top_lists_best_pair(tmp_path: Path):
     assert out.index("shared:") < out.index("only in A:")
 
 
-def test_find_overlapping_dirs_honors_min_size(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_find_overlapping_dirs_honors_min_size(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "x" / "small.txt", "hi")
     write_file(dir_b / "y" / "small-copy.txt", "hi")
     write_file(dir_a / "x" / "large.txt", "large-shared")
     write_file(dir_b / "y" / "large-copy.txt", "large-shared")
 
-    out = run_treeop(["--find-overlapping-dirs", "--top", "1", "--min-size", "5", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--find-overlapping-dirs", "--top", "1", "--min-size", "5", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert re.search(r"shared:\s+100\.0%/\s*\d+\.?\d* bytes,\s+100\.0%/\s*1 files", out)
 
 
-def test_find_overlapping_dirs_sorts_by_shared_bytes_percent(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_find_overlapping_dirs_sorts_by_shared_bytes_percent(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "mostly_bytes" / "big.txt", "x" * 100)
     write_file(dir_a / "mostly_bytes" / "small-unique.txt", "u")
@@ -613,28 +542,20 @@ def test_find_overlapping_dirs_sorts_by_shared_bytes_percent(tmp_path: Path):
     write_file(dir_b / "small_copies" / "one-copy.txt", "one")
     write_file(dir_b / "small_copies" / "two-copy.txt", "two")
 
-    out = run_treeop(["--find-overlapping-dirs", "--top", "1", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--find-overlapping-dirs", "--top", "1", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert f"A: {dir_b / 'big_copy'}" in out
     assert f"B: {dir_a / 'mostly_bytes'}" in out
     assert "mostly_files" not in out
 
 
-def test_find_overlapping_dirs_omits_zero_shared_bytes(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_find_overlapping_dirs_omits_zero_shared_bytes(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "x" / "one.txt", "one")
     write_file(dir_b / "y" / "two.txt", "two")
 
-    out = run_treeop(["--find-overlapping-dirs", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--find-overlapping-dirs", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert "overlapping-dirs:" in out
     assert "  (none)" in out
@@ -642,64 +563,40 @@ def test_find_overlapping_dirs_omits_zero_shared_bytes(tmp_path: Path):
     assert "shared:" not in out
 
 
-def test_find_overlapping_abbreviated_option(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_find_overlapping_abbreviated_option(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "x" / "one.txt", "one")
     write_file(dir_b / "y" / "copy.txt", "one")
 
-    out = run_treeop(["--find-overlapping", "--top", "1", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--find-overlapping", "--top", "1", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert "overlapping-dirs:" in out
     assert f"A: {dir_a / 'x'}" in out or f"A: {dir_b / 'y'}" in out
 
 
-def test_find_overlapping_dirs_prints_only_best_direction_per_pair(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_find_overlapping_dirs_prints_only_best_direction_per_pair(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "large" / "shared.txt", "shared")
     write_file(dir_a / "large" / "unique.txt", "unique")
     write_file(dir_b / "small" / "copy.txt", "shared")
 
-    out = run_treeop(["--find-overlapping-dirs", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--find-overlapping-dirs", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert out.count("\nA: ") == 1
     assert f"A: {dir_b / 'small'}" in out
     assert f"B: {dir_a / 'large'}" in out
 
 
-def test_find_overlapping_dirs_warns_and_skips_remove_when_internal_duplicates(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_find_overlapping_dirs_warns_and_skips_remove_when_internal_duplicates(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "dupdir" / "one.txt", "same")
     write_file(dir_a / "dupdir" / "two.txt", "same")
     write_file(dir_b / "copydir" / "copy.txt", "same")
 
-    out = run_treeop(["--find-overlapping-dirs", "--remove-copies", "--dry-run", "--top", "1", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--find-overlapping-dirs", "--remove-copies", "--dry-run", "--top", "1", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert "warning: B contains internal duplicates:" in out or "warning: A contains internal duplicates:" in out
     assert re.search(r"remove from A:\s+0 bytes,\s+0 files", out)
@@ -710,11 +607,6 @@ def test_find_overlapping_dirs_warns_and_skips_remove_when_internal_duplicates(t
 
 
 def test_find_redundant_dirs_top_sorts_by_redundant_bytes(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_b = tmp_path / "b"
     dir_c = tmp_path / "c"
@@ -730,7 +622,7 @@ def test_find_redundant_dirs_top_sorts_by_redundant_bytes(tmp_path: Path):
     write_file(dir_c / "small_copy" / "small.txt", "xy")
     write_file(dir_d / "unique" / "unique.txt", "unique")
 
-    out = run_treeop(["--find-redundant-dirs", "--top", "2", str(dir_a), str(dir_b), str(dir_c), str(dir_d)], root)
+    out = run_treeop(["--find-redundant-dirs", "--top", "2", str(dir_a), str(dir_b), str(dir_c), str(dir_d)], _REPO_ROOT)
 
     assert "redundant-dirs:" in out
     assert f"7 bytes / 2 files redundant" in out
@@ -742,34 +634,21 @@ def test_find_redundant_dirs_top_sorts_by_redundant_bytes(tmp_path: Path):
     assert out.index(str(dir_a / "many")) < out.index(str(dir_b / "large_copy"))
 
 
-def test_find_redundant_dirs_honors_min_size(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_find_redundant_dirs_honors_min_size(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "mixed" / "large.txt", "abcde")
     write_file(dir_a / "mixed" / "small.txt", "xy")
     write_file(dir_b / "copies" / "large.txt", "abcde")
     write_file(dir_b / "copies" / "small.txt", "xy")
 
-    out = run_treeop(["--find-redundant-dirs", "--min-size", "5", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--find-redundant-dirs", "--min-size", "5", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert f"5 bytes / 1 files redundant" in out
     assert f"7 bytes / 2 files redundant" not in out
 
 
 def test_remove_dir_internal_copies_dry_run_verbose(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     old = dir_a / "dupdir" / "old.txt"
@@ -779,11 +658,11 @@ def test_remove_dir_internal_copies_dry_run_verbose(tmp_path: Path):
     os.utime(old, (1000, 1000))
     os.utime(new, (2000, 2000))
 
-    out = run_treeop(["--remove-dir-internal-copies", "--dry-run", "-vvv", str(dir_a)], root)
+    out = run_treeop(["--remove-dir-internal-copies", "--dry-run", "-vvv", str(dir_a)], _REPO_ROOT)
 
     assert "remove-dir-internal-copies:" in out
-    assert re.search(r"removed-files:\s+1", out)
-    assert re.search(r"^[0-9a-f]+: Would remove ", out, re.MULTILINE)
+    assert _RE_REMOVED_FILES_1.search(out)
+    assert _RE_WOULD_REMOVE_LINE.search(out)
     assert f"Would remove {new}" in out
     assert "kept old.txt" in out
     assert f"kept {old}" not in out
@@ -796,11 +675,6 @@ def test_remove_dir_internal_copies_dry_run_verbose(tmp_path: Path):
 
 
 def test_remove_dir_internal_copies_verbose_prints_kept_file(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     old = dir_a / "dupdir" / "old.txt"
@@ -810,9 +684,9 @@ def test_remove_dir_internal_copies_verbose_prints_kept_file(tmp_path: Path):
     os.utime(old, (1000, 1000))
     os.utime(new, (2000, 2000))
 
-    out = run_treeop(["--remove-dir-internal-copies", "--dry-run", "-v", str(dir_a)], root)
+    out = run_treeop(["--remove-dir-internal-copies", "--dry-run", "-v", str(dir_a)], _REPO_ROOT)
 
-    assert re.search(r"^[0-9a-f]+: Would remove ", out, re.MULTILINE)
+    assert _RE_WOULD_REMOVE_LINE.search(out)
     assert f"Would remove {new}" in out
     assert "kept old.txt" in out
     assert "removed-date=" not in out
@@ -820,11 +694,6 @@ def test_remove_dir_internal_copies_verbose_prints_kept_file(tmp_path: Path):
 
 
 def test_remove_dir_internal_copies_actual(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     old = dir_a / "dupdir" / "old.txt"
@@ -834,20 +703,15 @@ def test_remove_dir_internal_copies_actual(tmp_path: Path):
     os.utime(old, (1000, 1000))
     os.utime(new, (2000, 2000))
 
-    out = run_treeop(["--remove-dir-internal-copies", str(dir_a)], root)
+    out = run_treeop(["--remove-dir-internal-copies", str(dir_a)], _REPO_ROOT)
 
     assert "remove-dir-internal-copies:" in out
-    assert re.search(r"removed-files:\s+1", out)
+    assert _RE_REMOVED_FILES_1.search(out)
     assert old.exists()
     assert not new.exists()
 
 
 def test_remove_dir_internal_copies_interactive_dry_run(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     old = dir_a / "dupdir" / "old.txt"
@@ -859,7 +723,7 @@ def test_remove_dir_internal_copies_interactive_dry_run(tmp_path: Path):
 
     out = run_treeop_pty(
         ["--remove-dir-internal-copies", "--interactive", "--dry-run", str(dir_a)],
-        root,
+        _REPO_ROOT,
         b"tt\033[Brq",
     )
 
@@ -880,17 +744,12 @@ def test_remove_dir_internal_copies_interactive_dry_run(tmp_path: Path):
     assert f"Would remove {new}" in out
     assert "No redundant files remain." in out
     assert "remove-dir-internal-copies:" in out
-    assert re.search(r"removed-files:\s+1", out)
+    assert _RE_REMOVED_FILES_1.search(out)
     assert old.exists()
     assert new.exists()
 
 
 def test_remove_dir_internal_copies_interactive_page_down(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     for i in range(12):
@@ -903,26 +762,18 @@ def test_remove_dir_internal_copies_interactive_page_down(tmp_path: Path):
 
     out = run_treeop_pty(
         ["--remove-dir-internal-copies", "--interactive", "--dry-run", str(dir_a)],
-        root,
+        _REPO_ROOT,
         b"\033[6~rq",
     )
 
     assert "PgUp/PgDn: page" in out
     assert f"Would remove {dir_a / 'dupdir' / '04-new.txt'}" in out
-    assert re.search(r"removed-files:\s+1", out)
+    assert _RE_REMOVED_FILES_1.search(out)
     assert (dir_a / "dupdir" / "04-new.txt").exists()
 
 
-def test_remove_dir_internal_copies_runs_before_overlap_remove_copies(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_dir_internal_copies_runs_before_overlap_remove_copies(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
     a_old = dir_a / "dupdir" / "old.txt"
     a_new = dir_a / "dupdir" / "new.txt"
     b_copy = dir_b / "copydir" / "copy.txt"
@@ -941,7 +792,7 @@ def test_remove_dir_internal_copies_runs_before_overlap_remove_copies(tmp_path:
         "1",
         str(dir_a),
         str(dir_b),
-    ], root)
+    ], _REPO_ROOT)
 
     assert "warning:" not in out
     assert re.search(r"remove from B:\s+\d+ bytes,\s+1 files", out)
@@ -950,16 +801,8 @@ def test_remove_dir_internal_copies_runs_before_overlap_remove_copies(tmp_path:
     assert not b_copy.exists()
 
 
-def test_find_overlapping_dirs_remove_copies_dry_run_and_verbose(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_find_overlapping_dirs_remove_copies_dry_run_and_verbose(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     a_old = dir_a / "pair" / "a-old.txt"
     a_new = dir_a / "pair" / "a-new.txt"
@@ -983,10 +826,10 @@ def test_find_overlapping_dirs_remove_copies_dry_run_and_verbose(tmp_path: Path)
         "1",
         str(dir_a),
         str(dir_b),
-    ], root)
+    ], _REPO_ROOT)
 
-    assert re.search(r"remove from A:\s+\d+\.?\d* bytes,\s+1 files", out)
-    assert re.search(r"remove from B:\s+\d+\.?\d* bytes,\s+1 files", out)
+    assert _RE_REMOVE_FROM_A_1.search(out)
+    assert _RE_REMOVE_FROM_B_1.search(out)
     assert f"Would remove A {a_new}" in out
     assert f"Would remove B {b_new}" in out
     assert f"kept {b_old}" in out
@@ -999,16 +842,8 @@ def test_find_overlapping_dirs_remove_copies_dry_run_and_verbose(tmp_path: Path)
     assert b_new.exists()
 
 
-def test_find_overlapping_dirs_remove_copies_actual_preserves_oldest(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_find_overlapping_dirs_remove_copies_actual_preserves_oldest(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     a_old = dir_a / "pair" / "a-old.txt"
     a_new = dir_a / "pair" / "a-new.txt"
@@ -1023,10 +858,10 @@ def test_find_overlapping_dirs_remove_copies_actual_preserves_oldest(tmp_path: P
     os.utime(b_old, (1000, 1000))
     os.utime(a_new, (2000, 2000))
 
-    out = run_treeop(["--find-overlapping-dirs", "--remove-copies", "--top", "1", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--find-overlapping-dirs", "--remove-copies", "--top", "1", str(dir_a), str(dir_b)], _REPO_ROOT)
 
-    assert re.search(r"remove from A:\s+\d+\.?\d* bytes,\s+1 files", out)
-    assert re.search(r"remove from B:\s+\d+\.?\d* bytes,\s+1 files", out)
+    assert _RE_REMOVE_FROM_A_1.search(out)
+    assert _RE_REMOVE_FROM_B_1.search(out)
     assert a_old.exists()
     assert not a_new.exists()
     assert b_old.exists()
@@ -1034,91 +869,57 @@ def test_find_overlapping_dirs_remove_copies_actual_preserves_oldest(tmp_path: P
 
 
 def test_top_requires_find_operation(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
 
-    result = run_treeop_result(["--top", "1", str(dir_a)], root)
+    result = run_treeop_result(["--top", "1", str(dir_a)], _REPO_ROOT)
 
     assert result.returncode != 0
     assert "--top requires --find-overlapping-dirs or --find-redundant-dirs." in result.stdout
     assert not (dir_a / ".dirdb").exists()
 
 
-def test_remove_copies_dry_run(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_copies_dry_run(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "same.txt", "hello")
     write_file(dir_b / "same.txt", "hello")
 
-    out = run_treeop(["--intersect", "--remove-copies", "--dry-run", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--intersect", "--remove-copies", "--dry-run", str(dir_a), str(dir_b)], _REPO_ROOT)
     assert (dir_a / "same.txt").exists()
     assert (dir_b / "same.txt").exists()
     assert "Would remove" in out
-    assert re.search(r"removed-files:\s+1", out)
-
+    assert _RE_REMOVED_FILES_1.search(out)
 
-def test_remove_copies_verbose_prints_extension_stats(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
 
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_copies_verbose_prints_extension_stats(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "same.txt", "hello")
     write_file(dir_b / "same.txt", "hello")
     write_file(dir_a / "same.jpg", "image")
     write_file(dir_b / "same.jpg", "image")
 
-    out = run_treeop(["--intersect", "--remove-copies", "--dry-run", "-v", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--intersect", "--remove-copies", "--dry-run", "-v", str(dir_a), str(dir_b)], _REPO_ROOT)
 
     assert "extension-stats:" in out
     assert re.search(r"\.txt\s*:\s*1 files,\s*5 bytes", out)
     assert re.search(r"\.jpg\s*:\s*1 files,\s*5 bytes", out)
 
 
-def test_remove_copies_actual(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_copies_actual(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "same.txt", "hello")
     write_file(dir_b / "same.txt", "hello")
 
-    out = run_treeop(["--intersect", "--remove-copies", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--intersect", "--remove-copies", str(dir_a), str(dir_b)], _REPO_ROOT)
     assert (dir_a / "same.txt").exists()
     assert not (dir_b / "same.txt").exists()
-    assert re.search(r"removed-files:\s+1", out)
+    assert _RE_REMOVED_FILES_1.search(out)
 
 
 def test_remove_copies_from_last(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_b = tmp_path / "b"
     dir_c = tmp_path / "c"
@@ -1130,44 +931,28 @@ def test_remove_copies_from_last(tmp_path: Path):
     write_file(dir_b / "same.txt", "hello")
     write_file(dir_c / "same.txt", "hello")
 
-    out = run_treeop(["--intersect", "--remove-copies-from-last", str(dir_a), str(dir_b), str(dir_c)], root)
+    out = run_treeop(["--intersect", "--remove-copies-from-last", str(dir_a), str(dir_b), str(dir_c)], _REPO_ROOT)
     assert (dir_a / "same.txt").exists()
     assert (dir_b / "same.txt").exists()
     assert not (dir_c / "same.txt").exists()
-    assert re.search(r"removed-files:\s+1", out)
-
+    assert _RE_REMOVED_FILES_1.search(out)
 
-def test_remove_copies_without_intersect(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
 
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_copies_without_intersect(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "same.txt", "hello")
-    time.sleep(1.1)
     write_file(dir_b / "same.txt", "hello")
+    bump_mtime_back(dir_a / "same.txt")
 
-    out = run_treeop(["--remove-copies", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--remove-copies", str(dir_a), str(dir_b)], _REPO_ROOT)
     assert (dir_a / "same.txt").exists()
     assert not (dir_b / "same.txt").exists()
-    assert re.search(r"removed-files:\s+1", out)
-
+    assert _RE_REMOVED_FILES_1.search(out)
 
-def test_remove_copies_interactive_dry_run(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
 
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_copies_interactive_dry_run(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     old = dir_a / "same.txt"
     new = dir_b / "same.txt"
@@ -1178,7 +963,7 @@ def test_remove_copies_interactive_dry_run(tmp_path: Path):
 
     out = run_treeop_pty(
         ["--remove-copies", "--interactive", "--dry-run", str(dir_a), str(dir_b)],
-        root,
+        _REPO_ROOT,
         b"\033[Brq",
     )
 
@@ -1187,21 +972,13 @@ def test_remove_copies_interactive_dry_run(tmp_path: Path):
     assert f"Would remove {new}" in out
     assert "No redundant files remain." in out
     assert "remove-copies:" in out
-    assert re.search(r"removed-files:\s+1", out)
+    assert _RE_REMOVED_FILES_1.search(out)
     assert old.exists()
     assert new.exists()
 
 
-def test_remove_copies_interactive_adjusts_min_size(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_copies_interactive_adjusts_min_size(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "small.txt", "x")
     write_file(dir_b / "small.txt", "x")
@@ -1210,7 +987,7 @@ def test_remove_copies_interactive_adjusts_min_size(tmp_path: Path):
 
     out = run_treeop_pty(
         ["--remove-copies", "--interactive", "--dry-run", str(dir_a), str(dir_b)],
-        root,
+        _REPO_ROOT,
         b"mmq",
     )
 
@@ -1225,15 +1002,10 @@ def test_remove_copies_interactive_adjusts_min_size(tmp_path: Path):
     assert (dir_b / "large.txt").exists()
 
 
-def test_stats_hardlinked_and_redundant(tmp_path: Path):
-    if not supports_hardlinks(tmp_path):
+def test_stats_hardlinked_and_redundant(tmp_path: Path, hardlinks_supported: bool):
+    if not hardlinks_supported:
         pytest.skip("Filesystem does not support hardlinks")
 
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     root_dir = tmp_path / "root"
     sub_dir = root_dir / "sub"
     root_dir.mkdir()
@@ -1245,10 +1017,10 @@ def test_stats_hardlinked_and_redundant(tmp_path: Path):
     write_file(root_dir / "hl.txt", "hlink!")
     os.link(root_dir / "hl.txt", sub_dir / "hl_link.txt")
 
-    out = run_treeop(["--stats", str(root_dir)], root)
+    out = run_treeop(["--stats", str(root_dir)], _REPO_ROOT)
 
     def stat_value(label: str) -> int:
-        match = re.search(rf"{label}\s+([0-9]+)", out, re.MULTILINE)
+        match = _stat_re(label).search(out)
         assert match, f"Missing {label} in output: {out}"
         return int(match.group(1))
 
@@ -1261,23 +1033,15 @@ def test_stats_hardlinked_and_redundant(tmp_path: Path):
     assert stat_value("hardlinked-size:") == 6
 
 
-def test_stats_total_for_multiple_roots(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_stats_total_for_multiple_roots(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "same-a.txt", "dupe")
     write_file(dir_a / "only-a.txt", "aaa")
     write_file(dir_b / "same-b.txt", "dupe")
     write_file(dir_b / "only-b.txt", "bbbbb")
 
-    out = run_treeop([str(dir_a), str(dir_b)], root)
+    out = run_treeop([str(dir_a), str(dir_b)], _REPO_ROOT)
     assert f"{dir_a}\n" in out
     assert f"{dir_b}\n" in out
     assert "total:\n" in out
@@ -1286,7 +1050,7 @@ def test_stats_total_for_multiple_roots(tmp_path: Path):
     total_section = out.split("total:\n", 1)[1]
 
     def total_stat_value(label: str) -> int:
-        match = re.search(rf"{label}\s+([0-9]+)", total_section, re.MULTILINE)
+        match = _stat_re(label).search(total_section)
         assert match, f"Missing {label} in total section: {out}"
         return int(match.group(1))
 
@@ -1298,56 +1062,41 @@ def test_stats_total_for_multiple_roots(tmp_path: Path):
 
 
 def test_stats_min_size_filters_stats_not_dirdb(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "small.txt", "xx")
     write_file(dir_a / "large.txt", "large-data")
 
-    out = run_treeop(["--stats", "--min-size", "5", str(dir_a)], root)
-    assert re.search(r"files:\s+1", out)
+    out = run_treeop(["--stats", "--min-size", "5", str(dir_a)], _REPO_ROOT)
+    assert _RE_FILES_1.search(out)
     assert re.search(r"total-size:\s+10 bytes", out)
     assert (dir_a / ".dirdb").exists()
 
-    file_list = run_treeop(["--list-files", "--min-size", "5", str(dir_a)], root)
+    file_list = run_treeop(["--list-files", "--min-size", "5", str(dir_a)], _REPO_ROOT)
     assert "small.txt" not in file_list
     assert "large.txt" in file_list
 
 
 def test_stats_max_size_filter(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "small.txt", "xx")
     write_file(dir_a / "large.txt", "large-data")
 
-    out = run_treeop(["--stats", "--max-size", "5", str(dir_a)], root)
-    assert re.search(r"files:\s+1", out)
+    out = run_treeop(["--stats", "--max-size", "5", str(dir_a)], _REPO_ROOT)
+    assert _RE_FILES_1.search(out)
     assert re.search(r"total-size:\s+2 bytes", out)
 
 
 def test_list_files_only_and_exclude_filters_filename(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
-    (dir_a / "sub").mkdir(parents=True)
+    os.makedirs(dir_a / "sub")
     write_file(dir_a / "photo.jpg", "jpg")
     write_file(dir_a / "sub" / "nested.png", "png")
     write_file(dir_a / "note.txt", "txt")
     write_file(dir_a / "photo.jpg~", "backup")
 
-    out = run_treeop(["--list-files", "--only", "*.jpg,*.png", "--exclude", "*~", str(dir_a)], root)
+    out = run_treeop(["--list-files", "--only", "*.jpg,*.png", "--exclude", "*~", str(dir_a)], _REPO_ROOT)
     assert "photo.jpg" in out
     assert "nested.png" in out
     assert "note.txt" not in out
@@ -1355,37 +1104,24 @@ def test_list_files_only_and_exclude_filters_filename(tmp_path: Path):
 
 
 def test_file_argument_selects_only_that_file_in_parent_dir(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "selected.jpg", "jpg")
     write_file(dir_a / "skipped.jpg", "other")
 
-    out = run_treeop(["--list-files", str(dir_a / "selected.jpg")], root)
+    out = run_treeop(["--list-files", str(dir_a / "selected.jpg")], _REPO_ROOT)
     assert "selected.jpg" in out
     assert "skipped.jpg" not in out
 
 
-def test_mixed_file_and_dir_arguments_apply_file_selection_per_dir(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_mixed_file_and_dir_arguments_apply_file_selection_per_dir(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
     write_file(dir_a / "selected.txt", "shared-selected")
     write_file(dir_b / "selected-copy.txt", "shared-selected")
     write_file(dir_a / "unselected.txt", "shared-unselected")
     write_file(dir_b / "unselected-copy.txt", "shared-unselected")
 
-    out = run_treeop(["--list-redundant", str(dir_a / "selected.txt"), str(dir_b)], root)
+    out = run_treeop(["--list-redundant", str(dir_a / "selected.txt"), str(dir_b)], _REPO_ROOT)
     assert "selected.txt" in out
     assert "selected-copy.txt" in out
     assert "unselected.txt" not in out
@@ -1393,11 +1129,6 @@ def test_mixed_file_and_dir_arguments_apply_file_selection_per_dir(tmp_path: Pat
 
 
 def test_list_files_verbose_prints_extension_stats(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "one.txt", "abc")
@@ -1405,7 +1136,7 @@ def test_list_files_verbose_prints_extension_stats(tmp_path: Path):
     write_file(dir_a / "image.jpg", "jpeg")
     write_file(dir_a / "README", "plain")
 
-    out = run_treeop(["--list-files", "-v", str(dir_a)], root)
+    out = run_treeop(["--list-files", "-v", str(dir_a)], _REPO_ROOT)
 
     assert "extension-stats:" in out
     assert re.search(r"\.txt\s*:\s*2 files,\s*7 bytes", out)
@@ -1414,11 +1145,6 @@ def test_list_files_verbose_prints_extension_stats(tmp_path: Path):
 
 
 def test_list_files_ionly_and_iexclude_filters_case_insensitively(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "PHOTO.JPG", "jpg")
@@ -1426,7 +1152,7 @@ def test_list_files_ionly_and_iexclude_filters_case_insensitively(tmp_path: Path
     write_file(dir_a / "note.TXT", "txt")
     write_file(dir_a / "PHOTO.JPG~", "backup")
 
-    out = run_treeop(["--list-files", "--ionly", "*.jpg,*.png", "--iexclude", "*~", str(dir_a)], root)
+    out = run_treeop(["--list-files", "--ionly", "*.jpg,*.png", "--iexclude", "*~", str(dir_a)], _REPO_ROOT)
     assert "PHOTO.JPG" in out
     assert "diagram.PNG" in out
     assert "note.TXT" not in out
@@ -1434,29 +1160,19 @@ def test_list_files_ionly_and_iexclude_filters_case_insensitively(tmp_path: Path
 
 
 def test_invalid_min_size_greater_than_max_size(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "file.txt", "hello")
 
-    result = run_treeop_result(["--stats", "--min-size", "10", "--max-size", "5", str(dir_a)], root)
+    result = run_treeop_result(["--stats", "--min-size", "10", "--max-size", "5", str(dir_a)], _REPO_ROOT)
     assert result.returncode != 0
     assert "--min-size must be less than or equal to --max-size." in result.stdout
 
 
-def test_break_hardlinks(tmp_path: Path):
-    if not supports_hardlinks(tmp_path):
+def test_break_hardlinks(tmp_path: Path, hardlinks_supported: bool):
+    if not hardlinks_supported:
         pytest.skip("Filesystem does not support hardlinks")
 
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     root_dir = tmp_path / "root"
     sub_dir = root_dir / "sub"
     root_dir.mkdir()
@@ -1468,20 +1184,15 @@ def test_break_hardlinks(tmp_path: Path):
     os.link(file_a, file_b)
     assert file_a.stat().st_ino == file_b.stat().st_ino
 
-    out = run_treeop(["--break-hardlinks", str(root_dir)], root)
+    out = run_treeop(["--break-hardlinks", str(root_dir)], _REPO_ROOT)
     assert "break-hardlinks:" in out
     assert file_a.stat().st_ino != file_b.stat().st_ino
 
 
-def test_break_hardlinks_min_size(tmp_path: Path):
-    if not supports_hardlinks(tmp_path):
+def test_break_hardlinks_min_size(tmp_path: Path, hardlinks_supported: bool):
+    if not hardlinks_supported:
         pytest.skip("Filesystem does not support hardlinks")
 
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     root_dir = tmp_path / "root"
     sub_dir = root_dir / "sub"
     root_dir.mkdir()
@@ -1496,21 +1207,16 @@ def test_break_hardlinks_min_size(tmp_path: Path):
     write_file(large_a, "large!")
     os.link(large_a, large_b)
 
-    out = run_treeop(["--break-hardlinks", "--min-size", "5", str(root_dir)], root)
+    out = run_treeop(["--break-hardlinks", "--min-size", "5", str(root_dir)], _REPO_ROOT)
     assert "break-hardlinks:" in out
     assert small_a.stat().st_ino == small_b.stat().st_ino
     assert large_a.stat().st_ino != large_b.stat().st_ino
 
 
-def test_list_hardlinks(tmp_path: Path):
-    if not supports_hardlinks(tmp_path):
+def test_list_hardlinks(tmp_path: Path, hardlinks_supported: bool):
+    if not hardlinks_supported:
         pytest.skip("Filesystem does not support hardlinks")
 
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     root_dir = tmp_path / "root"
     sub_dir = root_dir / "sub"
     root_dir.mkdir()
@@ -1521,20 +1227,15 @@ def test_list_hardlinks(tmp_path: Path):
     write_file(file_a, "hlink!")
     os.link(file_a, file_b)
 
-    out = run_treeop(["--list-hardlinks", str(root_dir)], root)
+    out = run_treeop(["--list-hardlinks", str(root_dir)], _REPO_ROOT)
     assert str(file_a) in out
     assert str(file_b) in out
 
 
-def test_list_hardlinks_min_size(tmp_path: Path):
-    if not supports_hardlinks(tmp_path):
+def test_list_hardlinks_min_size(tmp_path: Path, hardlinks_supported: bool):
+    if not hardlinks_supported:
         pytest.skip("Filesystem does not support hardlinks")
 
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     root_dir = tmp_path / "root"
     sub_dir = root_dir / "sub"
     root_dir.mkdir()
@@ -1549,7 +1250,7 @@ def test_list_hardlinks_min_size(tmp_path: Path):
     write_file(large_a, "large!")
     os.link(large_a, large_b)
 
-    out = run_treeop(["--list-hardlinks", "--min-size", "5", str(root_dir)], root)
+    out = run_treeop(["--list-hardlinks", "--min-size", "5", str(root_dir)], _REPO_ROOT)
     assert str(small_a) not in out
     assert str(small_b) not in out
     assert str(large_a) in out
@@ -1557,31 +1258,21 @@ def test_list_hardlinks_min_size(tmp_path: Path):
 
 
 def test_list_dirs(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_b = dir_a / "b"
-    dir_b.mkdir(parents=True)
+    os.makedirs(dir_b)
     write_file(dir_a / "file.txt", "hello")
     write_file(dir_b / "file.txt", "world")
 
-    out = run_treeop(["--list-dirs", str(dir_a)], root)
+    out = run_treeop(["--list-dirs", str(dir_a)], _REPO_ROOT)
     assert str(dir_a) in out
     assert str(dir_b) in out
 
 
-def test_stats_after_break_hardlinks_no_warning(tmp_path: Path):
-    if not supports_hardlinks(tmp_path):
+def test_stats_after_break_hardlinks_no_warning(tmp_path: Path, hardlinks_supported: bool):
+    if not hardlinks_supported:
         pytest.skip("Filesystem does not support hardlinks")
 
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     root_dir = tmp_path / "root"
     sub_dir = root_dir / "sub"
     root_dir.mkdir()
@@ -1590,160 +1281,109 @@ def test_stats_after_break_hardlinks_no_warning(tmp_path: Path):
     write_file(root_dir / "a.txt", "same")
     write_file(sub_dir / "b.txt", "same")
 
-    run_treeop(["--hardlink-copies", "--min-size", "1", str(root_dir)], root)
-    run_treeop(["--break-hardlinks", str(root_dir)], root)
-    out = run_treeop(["--stats", str(root_dir)], root)
+    run_treeop(["--hardlink-copies", "--min-size", "1", str(root_dir)], _REPO_ROOT, capture=False)
+    run_treeop(["--break-hardlinks", str(root_dir)], _REPO_ROOT, capture=False)
+    out = run_treeop(["--stats", str(root_dir)], _REPO_ROOT)
     assert "hardlinks outside root" not in out
 
 
-def test_list_both(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_list_both(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "same.txt", "same")
     write_file(dir_b / "same.txt", "same")
 
-    out = run_treeop(["--intersect", "--list-both", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--intersect", "--list-both", str(dir_a), str(dir_b)], _REPO_ROOT)
     assert "in-both:" in out
     assert "first:" in out
     assert "last:" in out
 
 
 def test_unique_hash_len(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "a.txt", "one")
     write_file(dir_a / "b.txt", "two")
 
-    out = run_treeop(["--get-unique-hash-len", str(dir_a)], root)
+    out = run_treeop(["--get-unique-hash-len", str(dir_a)], _REPO_ROOT)
     match = re.search(r"unique-hash-len:\s+([0-9]+)", out)
     assert match
     assert int(match.group(1)) > 0
 
 
 def test_size_histogram_max_size(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "small.txt", "ab")
     write_file(dir_a / "large.txt", "x" * 10)
 
-    out = run_treeop(["--size-histogram", "4", "--max-size", "4", str(dir_a)], root)
+    out = run_treeop(["--size-histogram", "4", "--max-size", "4", str(dir_a)], _REPO_ROOT)
     assert re.search(r":\s+1\s+2 bytes", out)
     assert "10 bytes" not in out
 
 
 def test_size_histogram_min_size(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "small.txt", "ab")
     write_file(dir_a / "large.txt", "x" * 10)
 
-    out = run_treeop(["--size-histogram", "4", "--min-size", "5", str(dir_a)], root)
+    out = run_treeop(["--size-histogram", "4", "--min-size", "5", str(dir_a)], _REPO_ROOT)
     assert re.search(r":\s+1\s+10 bytes", out)
     assert "2 bytes" not in out
 
 
 def test_invalid_size_histogram_fails_before_processing_dirs(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "file.txt", "hello")
 
-    result = run_treeop_result(["--size-histogram", "0", str(dir_a)], root)
+    result = run_treeop_result(["--size-histogram", "0", str(dir_a)], _REPO_ROOT)
     assert result.returncode != 0
     assert "--size-histogram must be greater than 0." in result.stdout
     assert not (dir_a / ".dirdb").exists()
 
 
 def test_bufsize_readbench(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "file.txt", "hello")
 
-    out = run_treeop(["--readbench", "--bufsize", "4k", str(dir_a)], root)
+    out = run_treeop(["--readbench", "--bufsize", "4k", str(dir_a)], _REPO_ROOT)
     assert "bufsize:" in out
 
 
 def test_lowercase_m_size_suffix(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "file.txt", "hello")
 
-    out = run_treeop(["--readbench", "--bufsize", "1m", str(dir_a)], root)
+    out = run_treeop(["--readbench", "--bufsize", "1m", str(dir_a)], _REPO_ROOT)
     assert "bufsize: 1 MB" in out
 
 
-def test_max_hardlinks(tmp_path: Path):
-    if not supports_hardlinks(tmp_path):
+def test_max_hardlinks(hardlinks_supported: bool, two_dirs: tuple[Path, Path]):
+    if not hardlinks_supported:
         pytest.skip("Filesystem does not support hardlinks")
 
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+    dir_a, dir_b = two_dirs
 
     file_a = dir_a / "same.txt"
     file_b = dir_b / "same.txt"
     write_file(file_a, "hello")
     write_file(file_b, "hello")
 
-    out = run_treeop(["--hardlink-copies", "--min-size", "1", "--max-hardlinks", "1", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--hardlink-copies", "--min-size", "1", "--max-hardlinks", "1", str(dir_a), str(dir_b)], _REPO_ROOT)
     assert file_a.stat().st_ino != file_b.stat().st_ino
-    assert re.search(r"hardlinks-created:\s+0", out)
+    assert _RE_HARDLINKS_CREATED_0.search(out)
 
 
 def test_progress_width(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "file.txt", "hello")
 
-    out = run_treeop(["--progress", "--width", "10", str(dir_a)], root)
+    out = run_treeop(["--progress", "--width", "10", str(dir_a)], _REPO_ROOT)
     assert "files:" in out
 
 
@@ -1766,83 +1406,56 @@ def setup_three_roots(tmp_path: Path):
     return dir_a, dir_b, dir_c
 
 
-def test_list_first_three_roots(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a, dir_b, dir_c = setup_three_roots(tmp_path)
-    out = run_treeop(["--intersect", "--list-first", str(dir_a), str(dir_b), str(dir_c)], root)
-    assert "only-in-first:" in out
-    assert str(dir_a / "first_only_a.txt") in out
-    assert str(dir_b / "first_only_b.txt") in out
-    assert str(dir_c / "last_only.txt") not in out
-
-
-def test_list_last_three_roots(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a, dir_b, dir_c = setup_three_roots(tmp_path)
-    out = run_treeop(["--intersect", "--list-last", str(dir_a), str(dir_b), str(dir_c)], root)
-    assert "only-in-last:" in out
-    assert str(dir_c / "last_only.txt") in out
-    assert str(dir_a / "first_only_a.txt") not in out
-    assert str(dir_b / "first_only_b.txt") not in out
-
-
-def test_extract_first_three_roots(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a, dir_b, dir_c = setup_three_roots(tmp_path)
-    dest = tmp_path / "out_first"
-    run_treeop(["--intersect", "--extract-first", str(dest), str(dir_a), str(dir_b), str(dir_c)], root)
-    assert (dest / "first_only_a.txt").exists()
-    assert (dest / "first_only_b.txt").exists()
-    assert not (dest / "last_only.txt").exists()
-    assert not (dest / "shared.txt").exists()
-    assert not (dest / "shared2.txt").exists()
-
-
-def test_extract_last_three_roots(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a, dir_b, dir_c = setup_three_roots(tmp_path)
-    dest = tmp_path / "out_last"
-    run_treeop(["--intersect", "--extract-last", str(dest), str(dir_a), str(dir_b), str(dir_c)], root)
-    assert (dest / "last_only.txt").exists()
-    assert not (dest / "first_only_a.txt").exists()
-    assert not (dest / "first_only_b.txt").exists()
-    assert not (dest / "shared.txt").exists()
-    assert not (dest / "shared2.txt").exists()
-
-
-def test_list_redundant_alignment(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+@pytest.fixture(scope="module")
+def three_roots_ro(tmp_path_factory):
+    """setup_three_roots() built and indexed once for tests that do not change the roots."""
+    roots = setup_three_roots(tmp_path_factory.mktemp("three"))
+    run_treeop([str(root) for root in roots], _REPO_ROOT, capture=False)
+    return roots
+
+
+@pytest.mark.parametrize(
+    "flag, header, listed, not_listed",
+    [
+        ("--list-first", "only-in-first:", ["a/first_only_a.txt", "b/first_only_b.txt"], ["c/last_only.txt"]),
+        ("--list-last", "only-in-last:", ["c/last_only.txt"], ["a/first_only_a.txt", "b/first_only_b.txt"]),
+    ],
+)
+def test_list_three_roots(three_roots_ro, flag, header, listed, not_listed):
+    dir_a, dir_b, dir_c = three_roots_ro
+    base = dir_a.parent
+    out = run_treeop(["--intersect", flag, str(dir_a), str(dir_b), str(dir_c)], _REPO_ROOT)
+    assert header in out
+    for rel in listed:
+        assert str(base / rel) in out
+    for rel in not_listed:
+        assert str(base / rel) not in out
+
+
+@pytest.mark.parametrize(
+    "flag, extracted",
+    [
+        ("--extract-first", {"first_only_a.txt", "first_only_b.txt"}),
+        ("--extract-last", {"last_only.txt"}),
+    ],
+)
+def test_extract_three_roots(tmp_path: Path, three_roots_ro, flag, extracted):
+    dir_a, dir_b, dir_c = three_roots_ro
+    dest = tmp_path / "out"
+    run_treeop(["--intersect", flag, str(dest), str(dir_a), str(dir_b), str(dir_c)], _REPO_ROOT, capture=False)
+    for name in ("first_only_a.txt", "first_only_b.txt", "last_only.txt", "shared.txt", "shared2.txt"):
+        assert (dest / name).exists() == (name in extracted), name
+
+
+def test_list_redundant_alignment(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "small.txt", "hi")
     write_file(dir_b / "small_copy.txt", "hi")
     write_file(dir_a / "big.txt", "x" * 3000)
     write_file(dir_b / "big_copy.txt", "x" * 3000)
 
-    out = run_treeop(["--list-redundant", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--list-redundant", str(dir_a), str(dir_b)], _REPO_ROOT)
     lines = [line for line in out.splitlines() if line.strip()]
     assert len(lines) == 4
     def hash_start(line: str) -> int:
@@ -1855,218 +1468,152 @@ def test_list_redundant_alignment(tmp_path: Path):
     assert all(start == starts[0] for start in starts)
 
 
-def test_list_redundant_min_size(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_list_redundant_min_size(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "small.txt", "hi")
     write_file(dir_b / "small_copy.txt", "hi")
     write_file(dir_a / "big.txt", "x" * 3000)
     write_file(dir_b / "big_copy.txt", "x" * 3000)
 
-    out = run_treeop(["--list-redundant", "--min-size", "5", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--list-redundant", "--min-size", "5", str(dir_a), str(dir_b)], _REPO_ROOT)
     assert "small.txt" not in out
     assert "small_copy.txt" not in out
     assert "big.txt" in out
     assert "big_copy.txt" in out
 
 
-def supports_hardlinks(tmp_path: Path) -> bool:
-    src = tmp_path / "hl_src"
-    dst = tmp_path / "hl_dst"
-    src.write_text("x", encoding="utf-8")
-    try:
-        os.link(src, dst)
-    except OSError:
-        return False
-    return True
-
-
-def test_hardlink_copies(tmp_path: Path):
-    if not supports_hardlinks(tmp_path):
+def test_hardlink_copies(hardlinks_supported: bool, two_dirs: tuple[Path, Path]):
+    if not hardlinks_supported:
         pytest.skip("Filesystem does not support hardlinks")
 
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+    dir_a, dir_b = two_dirs
 
     file_a = dir_a / "same.txt"
     file_b = dir_b / "same.txt"
     write_file(file_a, "hello")
     write_file(file_b, "hello")
 
-    out = run_treeop(["--hardlink-copies", "--min-size", "1", "--dry-run", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--hardlink-copies", "--min-size", "1", "--dry-run", str(dir_a), str(dir_b)], _REPO_ROOT)
     assert file_a.exists()
     assert file_b.exists()
     assert "Would hardlink" in out
 
-    out = run_treeop(["--hardlink-copies", "--min-size", "1", str(dir_a), str(dir_b)], root)
+    out = run_treeop(["--hardlink-copies", "--min-size", "1", str(dir_a), str(dir_b)], _REPO_ROOT)
     st_a = file_a.stat()
     st_b = file_b.stat()
     assert st_a.st_ino == st_b.st_ino
-    assert re.search(r"hardlinks-created:\s+1", out)
+    assert _RE_HARDLINKS_CREATED_1.search(out)
 
 
-def test_same_filename_intersect(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
+def test_same_filename_intersect(shared_tree):
+    dir_a, dir_b = shared_tree
 
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
-
-    write_file(dir_a / "one.txt", "same")
-    write_file(dir_b / "two.txt", "same")
-
-    out = run_treeop(["--intersect", str(dir_a), str(dir_b)], root)
-    assert re.search(r"shared-files:\s+2", out)
+    out = _cached_run(("--intersect", str(dir_a), str(dir_b)), str(_REPO_ROOT))
+    total_section = out.split("total:\n", 1)[1]
+    assert re.search(r"shared-files:\s+3", total_section)
 
-    out = run_treeop(["--intersect", "--same-filename", str(dir_a), str(dir_b)], root)
-    assert re.search(r"shared-files:\s+0", out)
+    out = _cached_run(("--intersect", "--same-filename", str(dir_a), str(dir_b)), str(_REPO_ROOT))
+    total_section = out.split("total:\n", 1)[1]
+    assert _RE_SHARED_FILES_2.search(total_section)
+    assert re.search(r"unique-files:\s+3", total_section)
 
 
-def test_same_filename_hardlink(tmp_path: Path):
-    if not supports_hardlinks(tmp_path):
+def test_same_filename_hardlink(hardlinks_supported: bool, two_dirs: tuple[Path, Path]):
+    if not hardlinks_supported:
         pytest.skip("Filesystem does not support hardlinks")
 
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+    dir_a, dir_b = two_dirs
 
     file_a = dir_a / "one.txt"
     file_b = dir_b / "two.txt"
     write_file(file_a, "same")
     write_file(file_b, "same")
 
-    run_treeop(["--hardlink-copies", "--same-filename", str(dir_a), str(dir_b)], root)
+    run_treeop(["--hardlink-copies", "--same-filename", str(dir_a), str(dir_b)], _REPO_ROOT, capture=False)
     st_a = file_a.stat()
     st_b = file_b.stat()
     assert st_a.st_ino != st_b.st_ino
 
 
-def test_same_filename_remove_copies(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_same_filename_remove_copies(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "one.txt", "same")
     write_file(dir_b / "two.txt", "same")
 
-    run_treeop(["--intersect", "--remove-copies", "--same-filename", str(dir_a), str(dir_b)], root)
+    run_treeop(["--intersect", "--remove-copies", "--same-filename", str(dir_a), str(dir_b)], _REPO_ROOT, capture=False)
     assert (dir_a / "one.txt").exists()
     assert (dir_b / "two.txt").exists()
 
 
-def test_update_dirdb(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
+def test_extract_hash_ignores_preceding_lines():
+    out = b"extension-stats:\n   3 05fe 2026-10-14 11:46:57 /x/file.txt\n"
+    assert extract_hash(out, "file.txt") == "05fe"
+    out = b"   1 7f77b 2026-10-14 11:46:57 /x/\xff\n   3 05fe 2026-10-14 11:46:57 /x/file.txt\n"
+    assert extract_hash(out, "file.txt") == "05fe"
 
+
+def test_update_dirdb(tmp_path: Path):
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "file.txt", "one")
+    bump_mtime_back(dir_a / "file.txt")
 
-    run_treeop([str(dir_a)], root)
+    run_treeop([str(dir_a)], _REPO_ROOT, capture=False)
     db_path = dir_a / ".dirdb"
     assert db_path.exists()
-    out = run_treeop(["--list-files", str(dir_a)], root)
+    out = run_treeop(["--list-files", str(dir_a)], _REPO_ROOT, text=False)
     first_hash = extract_hash(out, "file.txt")
 
-    time.sleep(1.1)
     write_file(dir_a / "file.txt", "two")
-    run_treeop(["--update-dirdb", str(dir_a)], root)
+    run_treeop(["--update-dirdb", str(dir_a)], _REPO_ROOT, capture=False)
     assert db_path.exists()
-    out = run_treeop(["--list-files", str(dir_a)], root)
+    out = run_treeop(["--list-files", str(dir_a)], _REPO_ROOT, text=False)
     second_hash = extract_hash(out, "file.txt")
     assert second_hash != first_hash
 
 
 def test_new_dirdb(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_a.mkdir()
     write_file(dir_a / "file.txt", "one")
+    bump_mtime_back(dir_a / "file.txt")
 
-    run_treeop([str(dir_a)], root)
+    run_treeop([str(dir_a)], _REPO_ROOT, capture=False)
     db_path = dir_a / ".dirdb"
     assert db_path.exists()
-    out = run_treeop(["--list-files", str(dir_a)], root)
+    out = run_treeop(["--list-files", str(dir_a)], _REPO_ROOT, text=False)
     first_hash = extract_hash(out, "file.txt")
 
-    time.sleep(1.1)
     write_file(dir_a / "file.txt", "two")
-    run_treeop(["--new-dirdb", str(dir_a)], root)
+    run_treeop(["--new-dirdb", str(dir_a)], _REPO_ROOT, capture=False)
     assert db_path.exists()
-    out = run_treeop(["--list-files", str(dir_a)], root)
+    out = run_treeop(["--list-files", str(dir_a)], _REPO_ROOT, text=False)
     second_hash = extract_hash(out, "file.txt")
     assert second_hash != first_hash
 
 
 def test_remove_dirdb(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_b = dir_a / "b"
-    dir_b.mkdir(parents=True)
+    os.makedirs(dir_b)
     write_file(dir_a / "file.txt", "one")
     write_file(dir_b / "file.txt", "two")
 
-    run_treeop([str(dir_a)], root)
+    run_treeop([str(dir_a)], _REPO_ROOT, capture=False)
     assert (dir_a / ".dirdb").exists()
     assert (dir_b / ".dirdb").exists()
 
-    run_treeop(["--remove-dirdb", str(dir_a)], root)
+    run_treeop(["--remove-dirdb", str(dir_a)], _REPO_ROOT, capture=False)
     assert not (dir_a / ".dirdb").exists()
     assert not (dir_b / ".dirdb").exists()
 
 
-def test_readbench(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_a.mkdir()
-    write_file(dir_a / "file.txt", "hello")
+def test_readbench(shared_tree):
+    dir_a, _ = shared_tree
 
-    out = run_treeop(["--readbench", str(dir_a)], root)
+    out = _cached_run(("--readbench", str(dir_a)), str(_REPO_ROOT))
     assert "total-files:" in out
     assert "total-dirs:" in out
     assert "total-size:" in out
@@ -2076,57 +1623,39 @@ def test_readbench(tmp_path: Path):
 
 
 def test_remove_empty_dirs(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_b = dir_a / "b"
-    dir_b.mkdir(parents=True)
+    os.makedirs(dir_b)
     write_file(dir_b / "file.txt", "hello")
 
-    run_treeop([str(dir_a)], root)
+    run_treeop([str(dir_a)], _REPO_ROOT, capture=False)
     assert (dir_b / ".dirdb").exists()
 
     os.remove(dir_b / "file.txt")
-    out = run_treeop(["--remove-empty-dirs", str(dir_a)], root)
+    out = run_treeop(["--remove-empty-dirs", str(dir_a)], _REPO_ROOT)
     assert "removed-dirs:" in out
     assert not dir_b.exists()
 
 
-def test_remove_empty_dirs_after_remove_copies(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
-    dir_a = tmp_path / "a"
-    dir_b = tmp_path / "b"
-    dir_a.mkdir()
-    dir_b.mkdir()
+def test_remove_empty_dirs_after_remove_copies(two_dirs: tuple[Path, Path]):
+    dir_a, dir_b = two_dirs
 
     write_file(dir_a / "file.txt", "same")
     write_file(dir_b / "file.txt", "same")
 
-    run_treeop(["--intersect", "--remove-copies", "--remove-empty-dirs", "-v", str(dir_a), str(dir_b)], root)
+    run_treeop(["--intersect", "--remove-copies", "--remove-empty-dirs", "-v", str(dir_a), str(dir_b)], _REPO_ROOT, capture=False)
     assert dir_a.exists()
     assert not dir_b.exists()
 
 
 def test_remove_empty_dirs_dry_run(tmp_path: Path):
-    root = Path(__file__).resolve().parents[1]
-    bin_path = treeop_bin()
-    if not bin_path.exists():
-        return
-
     dir_a = tmp_path / "a"
     dir_b = dir_a / "b"
-    dir_b.mkdir(parents=True)
+    os.makedirs(dir_b)
     write_file(dir_b / "file.txt", "hello")
 
-    run_treeop([str(dir_a)], root)
+    run_treeop([str(dir_a)], _REPO_ROOT, capture=False)
     os.remove(dir_b / "file.txt")
-    out = run_treeop(["--remove-empty-dirs", "--dry-run", str(dir_a)], root)
+    out = run_treeop(["--remove-empty-dirs", "--dry-run", str(dir_a)], _REPO_ROOT)
     assert "removed-dirs:" in out
     assert dir_b.exists()